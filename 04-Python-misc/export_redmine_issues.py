@@ -12,6 +12,8 @@ Algorithm Summary
 Setup
     Load config, logging, and API key
     Determine created_on filter and mode
+    Metadata (projects, statuses, custom field values) is loaded on first use
+    through redmine_metadata.py and cached on disk (cache_dir, cache_ttl)
 
 Project Discovery
     Load all subprojects under "Project-Beast" and "Project-Alfa"
@@ -42,6 +44,7 @@ import logging
 from datetime import datetime
 import sys
 from pathlib import Path
+from redmine_metadata import RedmineMetadata, DEFAULT_TTL
 
 # Format Redmine datetime to match UI
 def format_dt(value):
@@ -50,21 +53,6 @@ def format_dt(value):
     except:
         return ''
 
-def get_custom_field_enum_mapping():
-    url = f"{base_url}/custom_fields.json"
-    resp = requests.get(url, headers=headers)
-    if resp.status_code != 200:
-        log_and_print("Failed to fetch custom fields.")
-        return {}
-
-    fields = resp.json().get('custom_fields', [])
-    mapping = {}
-    for field in fields:
-        if field.get('name') == 'Pieteikuma tips' and 'possible_values' in field:
-            mapping = {val['value']: val['label'] for val in field['possible_values']}
-            break
-    return mapping
-
 # Setup
 script_dir = Path(__file__).resolve().parent
 log_file = script_dir / "redmine_export.log"
@@ -95,46 +83,25 @@ except KeyError as e:
 
 created_on = config['redmine'].get('created_on', '')
 headers = {'X-Redmine-API-Key': api_key}
-pieteikuma_tips_mapping = get_custom_field_enum_mapping()
-
-status_mapping = {
-    '1': 'Reģistrēts',
-    '19': 'Piešķirts',
-    '37': 'Saskaņošanā',
-    '35': 'Saskaņots',
-    '32': 'Saskaņots finansējums',
-    '36': 'Izskatīšanā',
-    '34': 'Saskaņots struktūrvienībā',
-    '33': 'Saskaņots ITS',
-    '20': 'Precizēšana',
-    '21': 'Izpilde: Izpildē',
-    '27': 'Izpilde: Testēšanā',
-    '28': 'Izpilde: Izpildīts',
-    '5': 'Slēgts'
-}
+metadata = RedmineMetadata(
+    base_url,
+    headers,
+    config['redmine'].get('cache_dir', str(script_dir / '.redmine_cache')),
+    ttl=int(config['redmine'].get('cache_ttl', DEFAULT_TTL)),
+    log=log_and_print
+)
 
 def get_target_project_ids():
     root_identifiers = {"pieteikumu-registrs", "isian-projekti"}
-    all_projects = []
-    offset = 0
-    while True:
-        url = f"{base_url}/projects.json?limit=100&offset={offset}&include=trackers"
-        resp = requests.get(url, headers=headers)
-        if resp.status_code != 200:
-            log_and_print("Failed to fetch project list.")
-            break
-        data = resp.json()
-        projects = data.get("projects", [])
-        all_projects.extend(projects)
-        if len(projects) < 100:
-            break
-        offset += 100
-
+    all_projects = metadata.projects()
     root_ids = {p["id"] for p in all_projects if p["identifier"] in root_identifiers}
     child_ids = {p["id"] for p in all_projects if p.get("parent", {}).get("id") in root_ids}
     return list(root_ids | child_ids)
 
 project_ids = get_target_project_ids()
+if not project_ids:
+    log_and_print("No target projects found in Redmine - nothing to export.")
+    sys.exit(1)
 log_and_print(f"Selected project IDs: {project_ids}")
 
 for export_mode in export_modes:
@@ -199,6 +166,7 @@ for export_mode in export_modes:
         if export_mode == "journal":
             headers = ['Issue ID', 'Journal ID', 'Project', 'Subject', 'Author', 'Created On', 'Notes', 'Changed Field', 'Old Value', 'New Value']
             writer.writerow(headers)
+            status_mapping = metadata.status_id_to_name()
             for issue in all_issues:
                 issue_id = issue['id']
                 project = issue.get('project', {}).get('name', '')
@@ -232,6 +200,7 @@ for export_mode in export_modes:
                 'Pielikumi', 'Checklist', 'Atrisinājums', 'LUIS komponente', 'Pieteikuma tips',
                 'Private', 'Story points', 'Sprint', 'Apraksts', 'Last notes']
             writer.writerow(csv_headers)
+            pieteikuma_tips_mapping = metadata.custom_field_enum('Pieteikuma tips')
             for issue in all_issues:
                 cf_dict = {}
                 for cf in issue.get('custom_fields', []):
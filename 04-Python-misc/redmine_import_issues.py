@@ -10,13 +10,15 @@ Algorithm:
 ----------
 1. Initialize logging and load API/config settings.
 2. Load CSV file from Downloads directory.
-3. Fetch metadata from Redmine:
+3. Fetch metadata from Redmine (cached on disk via redmine_metadata.py):
    - Issue statuses and their Redmine IDs.
+   - Users (login -> ID), loaded on first assignee lookup.
 4. For each row in the CSV:
    - Skip if Xid starts with 'R' (issue originates in Redmine).
    - Map the CSV status to a Redmine status.
      - Skip if Redmine status not found.
    - Map the assignee code to Redmine user ID.
+     - assignee_mapping first, then Redmine user login.
      - Use default user if unknown or empty.
    - Determine if the issue already exists in Redmine by checking for Xid in the description.
    - Build the issue payload with subject, status, assignee, and other fields.
@@ -71,7 +73,8 @@ Other Notes:
 - Default tracker: Pieteikums (ID 1)
 - Default priority: Normāla (ID 2)
 - Default assignee: 7037 (BigJoshn)
-    - assignee is recognized from dictionary, if not found- assign default
+    - assignee is recognized from dictionary or Redmine users, if not found- assign default
+- Metadata cache: `cache_dir` (default .redmine_cache) and `cache_ttl` seconds in config
 """
 
 import configparser
@@ -81,6 +84,7 @@ from pathlib import Path
 import requests
 import pandas as pd
 from datetime import datetime
+from redmine_metadata import RedmineMetadata, DEFAULT_TTL
 
 # Initialize counters
 success_count = 0
@@ -125,8 +129,15 @@ except KeyError as e:
 
 headers = {"X-Redmine-API-Key": api_key, "Content-Type": "application/json"}
 max_rows = int(redmine_config.get("max_rows", 0))
+metadata = RedmineMetadata(
+    base_url,
+    headers,
+    redmine_config.get("cache_dir", str(script_dir / ".redmine_cache")),
+    ttl=int(redmine_config.get("cache_ttl", DEFAULT_TTL)),
+    log=log_and_print
+)
 
-# Status mapping
+# Status mapping: Core status -> Redmine status name (IDs are resolved from Redmine)
 status_mapping = {
     "Pabeigts": "Izpilde: Izpildīts",
     "Slēgts": "Slēgts",
@@ -142,7 +153,7 @@ status_mapping = {
     "Daļējs risinājums": "Precizēšana"
 }
 
-# Assignee mapping
+# Assignee mapping: Core code -> Redmine user ID, checked before Redmine logins
 assignee_mapping = {
     "INTA": 24,   # Bob Dylan
     "PECA": 312   # Diva Boba
@@ -168,13 +179,7 @@ for correct, variants in column_fixes.items():
             df.rename(columns={col: correct}, inplace=True)
             log_and_print(f"Renamed column '{col}' → '{correct}'")
 
-def fetch_status_name_id_map():
-    resp = requests.get(f"{base_url}/issue_statuses.json", headers=headers)
-    return {s["name"]: s["id"] for s in resp.json().get("issue_statuses", [])} if resp.ok else {}
-
-status_name_to_id = fetch_status_name_id_map()
-
-missing_statuses = set(status_mapping.values()) - set(status_name_to_id.keys())
+missing_statuses = set(status_mapping.values()) - set(metadata.status_name_to_id().keys())
 if missing_statuses:
     log_and_print(f"Warning: The following mapped statuses are not found in Redmine: {missing_statuses}")
 
@@ -188,6 +193,10 @@ def find_issue_by_xid(xid):
             return issue
     return None
 
+def resolve_assignee(assignee_code):
+    # Returns None when the code is neither mapped nor a Redmine login
+    return assignee_mapping.get(assignee_code) or metadata.user_login_to_id().get(assignee_code)
+
 def add_internal_comment(issue_id, comment):
     url = f"{base_url}/issues/{issue_id}.json"
     data = {"issue": {"notes": comment, "private_notes": True}}
@@ -206,7 +215,7 @@ def create_or_update_issue(row):
 
     original_status = row["Tips Statuss"]
     mapped_status = status_mapping.get(original_status, "Reģistrēts")
-    status_id = status_name_to_id.get(mapped_status)
+    status_id = metadata.status_name_to_id().get(mapped_status)
 
     if not status_id:
         log_and_print(f"Xid {xid}: Skipped - Redmine status not found for '{original_status}' → '{mapped_status}'")
@@ -216,12 +225,12 @@ def create_or_update_issue(row):
     assignee_code_raw = row.get("Izpilda", "")
     assignee_code = str(assignee_code_raw).strip().upper()
 
+    assignee_id = None
     if not assignee_code or assignee_code == "NAN":
-        assignee_id = default_assignee
         log_and_print(f"Xid {xid}: No assignee provided. Defaulting to API user ID {default_assignee}")
     else:
-        assignee_id = assignee_mapping.get(assignee_code, default_assignee)
-        if assignee_id == default_assignee:
+        assignee_id = resolve_assignee(assignee_code)
+        if assignee_id is None:
             log_and_print(f"Xid {xid}: Unrecognized assignee code '{assignee_code}', using default user ID {default_assignee}")
         else:
             log_and_print(f"Xid {xid}: Assigned to Redmine user ID {assignee_id} for code '{assignee_code}'")
@@ -236,7 +245,7 @@ def create_or_update_issue(row):
         "status_id": status_id
     }
 
-    if assignee_code in assignee_mapping:
+    if assignee_id is not None:
         issue_data["assigned_to_id"] = assignee_id
 
     # Start date
@@ -0,0 +1,206 @@
+"""
+Redmine metadata cache shared by the import/export scripts
+
+Description:
+------------
+Looks up Redmine metadata (issue statuses, custom field enumerations, projects
+and users) through the REST API and keeps it on disk, so repeated runs do not
+have to download the same tables again at startup.
+
+Algorithm:
+----------
+1. Nothing is fetched when the cache is created - every table is loaded on
+   first use and then kept in memory for the rest of the run.
+2. Each table is stored as one JSON file in the cache directory, holding all
+   pages fetched together plus the ETag of every page.
+   - Fresh (younger than the TTL): used as is, no request sent.
+   - Stale: every page is revalidated with If-None-Match.
+     - All pages 304 Not Modified: stored table is reused, timestamp refreshed.
+     - Otherwise: all pages are downloaded again and stored as a new snapshot.
+     - Error: stale table is used if available, otherwise the lookup is empty.
+3. 401/403/404 answers are cached for the TTL as well, so e.g. the users
+   table is not requested on every run with a non-admin API key.
+4. Files are written to a temp file and renamed into place, so concurrent
+   runs never read a half-written entry.
+
+Usage:
+------
+    metadata = RedmineMetadata(base_url, headers, cache_dir, ttl=3600, log=log_and_print)
+    metadata.status_name_to_id()       # {"Slēgts": 5, ...}
+    metadata.status_id_to_name()       # {"5": "Slēgts", ...}
+    metadata.custom_field_enum("Pieteikuma tips")
+    metadata.projects()
+    metadata.user_login_to_id()        # {"INTA": 24, ...}
+
+Other Notes:
+------------
+- Custom fields and users endpoints require an admin API key.
+- Only the fields used by the lookups are stored (see COLLECTION_FIELDS);
+  for users that is id and login.
+- Delete the cache directory to force a full reload.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+DEFAULT_TTL = 3600  # seconds
+PAGE_LIMIT = 100
+NEGATIVE_STATUSES = {401, 403, 404}
+
+# Fields kept per table - everything else in the API response is dropped
+COLLECTION_FIELDS = {
+    "issue_statuses": ("id", "name"),
+    "custom_fields": ("name", "possible_values"),
+    "projects": ("id", "identifier", "parent"),
+    "users": ("id", "login"),
+}
+
+
+class RedmineMetadata:
+    def __init__(self, base_url, headers, cache_dir, ttl=DEFAULT_TTL, log=print):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {k: v for k, v in headers.items() if k != "Content-Type"}
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.log = log
+        self._loaded = {}
+        self._lookups = {}
+
+    # Lookups
+    def status_name_to_id(self):
+        return self._lookup("status_name_to_id", lambda: {
+            s["name"]: s["id"] for s in self._collection("issue_statuses")})
+
+    def status_id_to_name(self):
+        return self._lookup("status_id_to_name", lambda: {
+            str(s["id"]): s["name"] for s in self._collection("issue_statuses")})
+
+    def custom_field_enum(self, field_name):
+        def build():
+            for field in self._collection("custom_fields"):
+                if field.get("name") == field_name and "possible_values" in field:
+                    return {val["value"]: val.get("label", val["value"]) for val in field["possible_values"]}
+            return {}
+        return self._lookup(f"custom_field_enum:{field_name}", build)
+
+    def projects(self):
+        return self._collection("projects", paginated=True)
+
+    def user_login_to_id(self):
+        return self._lookup("user_login_to_id", lambda: {
+            u["login"].upper(): u["id"] for u in self._collection("users", paginated=True) if u.get("login")})
+
+    # Loading
+    def _lookup(self, name, build):
+        if name not in self._lookups:
+            self._lookups[name] = build()
+        return self._lookups[name]
+
+    def _collection(self, key, paginated=False):
+        if key not in self._loaded:
+            self._loaded[key] = self._load(key, paginated)
+        return self._loaded[key]
+
+    def _load(self, key, paginated):
+        cache_file = self._cache_file(key)
+        entry = self._read_entry(cache_file)
+
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            return entry.get("items", [])
+
+        if entry and "items" in entry and self._not_modified(key, paginated, entry["etags"]):
+            entry["fetched_at"] = time.time()
+            self._write_entry(cache_file, entry)
+            return entry["items"]
+
+        items, etags, error = self._fetch_all(key, paginated)
+        if error is None:
+            self._write_entry(cache_file, {"fetched_at": time.time(), "etags": etags, "items": items})
+            return items
+
+        if entry and "items" in entry:
+            self.log(f"Using stale cached metadata for {key}")
+            return entry["items"]
+        if error in NEGATIVE_STATUSES:
+            self.log(f"Metadata {key} not available ({error}), not retrying for {self.ttl} s")
+            self._write_entry(cache_file, {"fetched_at": time.time(), "failed": error})
+        if items:
+            self.log(f"Incomplete {key} list: pagination stopped after {len(items)} records")
+        return items
+
+    def _page_path(self, key, paginated, offset):
+        return f"/{key}.json?limit={PAGE_LIMIT}&offset={offset}" if paginated else f"/{key}.json"
+
+    def _not_modified(self, key, paginated, etags):
+        if not etags or not all(etags):
+            return False
+        for page_no, etag in enumerate(etags):
+            resp = self._request(self._page_path(key, paginated, page_no * PAGE_LIMIT), {"If-None-Match": etag})
+            if resp is None or resp.status_code != 304:
+                return False
+        return True
+
+    def _fetch_all(self, key, paginated):
+        # Returns (items, etags, error); error is None only for a complete table
+        fields = COLLECTION_FIELDS[key]
+        items = []
+        etags = []
+        offset = 0
+        while True:
+            path = self._page_path(key, paginated, offset)
+            resp = self._request(path)
+            if resp is None:
+                return items, etags, "request failed"
+            if resp.status_code != 200:
+                self.log(f"Failed to fetch {path}: {resp.status_code}")
+                return items, etags, resp.status_code
+            try:
+                batch = resp.json().get(key, [])
+            except ValueError:
+                self.log(f"Failed to fetch {path}: response is not JSON")
+                return items, etags, "invalid JSON"
+            items.extend({f: item[f] for f in fields if f in item} for item in batch)
+            etags.append(resp.headers.get("ETag"))
+            if not paginated or len(batch) < PAGE_LIMIT:
+                return items, etags, None
+            offset += PAGE_LIMIT
+
+    def _request(self, path, extra_headers=None):
+        try:
+            return requests.get(f"{self.base_url}{path}", headers={**self.headers, **(extra_headers or {})})
+        except requests.RequestException as e:
+            self.log(f"Metadata request failed for {path}: {e}")
+            return None
+
+    # Disk cache
+    def _cache_file(self, key):
+        # API key is part of the key: different users may see different projects/fields
+        api_key = self.headers.get("X-Redmine-API-Key", "")
+        digest = hashlib.sha1(f"{api_key}|{self.base_url}|{key}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_entry(self, cache_file):
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, cache_file, entry):
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.log(f"Could not write metadata cache {cache_file}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)